@@ -0,0 +1,857 @@
+"""
+Monte Carlo Retirement Simulation API
+Vercel Python Serverless Function
+
+Uses historical bootstrap sampling from 1988-2024 market data.
+"""
+
+from http.server import BaseHTTPRequestHandler
+import json
+import logging
+from collections import namedtuple
+import numpy as np
+from pathlib import Path
+
+# Numba is optional and not in requirements.txt, so deploys run the NumPy kernel: numba and
+# llvmlite would add ~160 MB to the bundle, and at this API's sizes the JIT doesn't pay off
+try:
+    from numba import njit, prange
+except ImportError:
+    njit = None
+    prange = range
+
+logger = logging.getLogger(__name__)
+
+class handler(BaseHTTPRequestHandler):
+    def do_POST(self):
+        """Handle POST request for Monte Carlo simulation"""
+        try:
+            # Read request body
+            content_length = int(self.headers['Content-Length'])
+            post_data = self.rfile.read(content_length)
+            request_data = json.loads(post_data.decode('utf-8'))
+
+            # Extract parameters
+            years = request_data.get('years', 25)
+            withdrawal_rate = request_data.get('withdrawalRate', 5.0) / 100  # Convert to decimal
+            inflation_input = request_data.get('inflation')  # None or number
+            run_allocation_sweep = request_data.get('allocationSweep', False)
+            run_stress_test = request_data.get('historicalStressTest', False)
+            find_optimal_allocation = request_data.get('findOptimalHistoricalAllocation', False)
+            seed = request_data.get('seed')  # Optional, for reproducible Monte Carlo runs
+            precision = request_data.get('precision')  # Optional success rate precision (%), allows early stopping
+
+            # Run historical stress test, optimal allocation finder, allocation sweep, or single simulation
+            if find_optimal_allocation:
+                result = find_optimal_historical_allocation(
+                    years=years,
+                    withdrawal_rate=withdrawal_rate
+                )
+            elif run_stress_test:
+                stock_allocation = request_data.get('stockAllocation', 70) / 100
+                bond_allocation = request_data.get('bondAllocation', 30) / 100
+                result = run_historical_stress_test(
+                    years=years,
+                    withdrawal_rate=withdrawal_rate,
+                    stock_allocation=stock_allocation,
+                    bond_allocation=bond_allocation
+                )
+            elif run_allocation_sweep:
+                result = run_allocation_sweep_analysis(
+                    years=years,
+                    withdrawal_rate=withdrawal_rate,
+                    inflation_input=inflation_input,
+                    seed=seed
+                )
+            else:
+                stock_allocation = request_data.get('stockAllocation', 70) / 100
+                bond_allocation = request_data.get('bondAllocation', 30) / 100
+                result = run_monte_carlo(
+                    years=years,
+                    withdrawal_rate=withdrawal_rate,
+                    inflation_input=inflation_input,
+                    stock_allocation=stock_allocation,
+                    bond_allocation=bond_allocation,
+                    seed=seed,
+                    precision=precision / 100 if precision is not None else None
+                )
+
+            # Send response
+            self.send_response(200)
+            self.send_header('Content-type', 'application/json')
+            self.send_header('Access-Control-Allow-Origin', '*')
+            self.end_headers()
+            self.wfile.write(json.dumps(result).encode('utf-8'))
+
+        except Exception as e:
+            # Error response
+            self.send_response(500)
+            self.send_header('Content-type', 'application/json')
+            self.send_header('Access-Control-Allow-Origin', '*')
+            self.end_headers()
+            error_response = {
+                'error': str(e),
+                'message': 'Monte Carlo simulation failed'
+            }
+            self.wfile.write(json.dumps(error_response).encode('utf-8'))
+
+    def do_OPTIONS(self):
+        """Handle CORS preflight"""
+        self.send_response(200)
+        self.send_header('Access-Control-Allow-Origin', '*')
+        self.send_header('Access-Control-Allow-Methods', 'POST, OPTIONS')
+        self.send_header('Access-Control-Allow-Headers', 'Content-Type')
+        self.end_headers()
+
+
+# One contiguous array per series (structure of arrays), indexed by historical month
+MonthlySeries = namedtuple('MonthlySeries', ['sp500', 'bond', 'infl'])
+
+
+def _prebuilt_data_is_stale(csv_path, npy_paths, num_months):
+    """Whether the CSV is newer than the .npy files built from it, or has a different number of months"""
+    if not csv_path.exists():
+        return False
+    if csv_path.stat().st_mtime > min(path.stat().st_mtime for path in npy_paths):
+        return True
+    with open(csv_path) as f:
+        csv_months = sum(1 for line in f if line.strip()) - 1  # Minus the header
+    return csv_months != num_months
+
+
+def _load_historical_data_uncached():
+    """Load historical market returns (and their month-end dates), preferring the prebuilt .npy files"""
+    # Find the data files (works both locally and on Vercel)
+    data_dir = Path(__file__).parent.parent / 'data'
+    returns_npy = data_dir / 'monthly_returns.npy'
+    dates_npy = data_dir / 'monthly_returns_dates.npy'
+    csv_path = data_dir / 'monthly_returns.csv'
+
+    if returns_npy.exists() and dates_npy.exists():
+        # Built from the CSV by scripts/build_monthly_returns_npy.py as (3, months) float32,
+        # so each series is a contiguous row of the memory-mapped file
+        returns = np.load(returns_npy, mmap_mode='r')
+        dates = np.load(dates_npy)
+        if not _prebuilt_data_is_stale(csv_path, (returns_npy, dates_npy), len(dates)):
+            return MonthlySeries(*returns), dates
+        logger.warning("%s changed after the .npy files were built from it; loading the CSV instead "
+                       "(re-run scripts/build_monthly_returns_npy.py)", csv_path)
+
+    if not csv_path.exists():
+        raise FileNotFoundError(f"Historical data not found at {csv_path}")
+
+    # Plain NumPy parse; pandas would only add import time to every cold start
+    with open(csv_path) as f:
+        columns = f.readline().strip().split(',')
+        rows = np.loadtxt(f, delimiter=',', dtype=str, ndmin=2)
+
+    def percent_column(name):
+        # Convert percentages to decimals; float32 is far more precision than these
+        # monthly percentages carry, and halves the memory traffic of the bootstrap gathers
+        return np.ascontiguousarray(rows[:, columns.index(name)].astype(np.float64) / 100, dtype=np.float32)
+
+    returns = MonthlySeries(
+        sp500=percent_column('SP500_Total_Return'),
+        bond=percent_column('Treasury_5Y_Total_Return'),
+        infl=percent_column('Inflation_Monthly')
+    )
+    dates = rows[:, columns.index('Date')].astype('datetime64[D]')
+
+    return returns, dates
+
+
+# Parsed once per process, so warm invocations skip the CSV read entirely
+_HIST, _HIST_DATES = _load_historical_data_uncached()
+
+# Monthly growth factors (1 + return), precomputed so the simulation hot loop is a pure multiply
+_HIST_GROWTH = MonthlySeries(sp500=1 + _HIST.sp500, bond=1 + _HIST.bond, infl=1 + _HIST.infl)
+
+
+def load_historical_data():
+    """Return the cached MonthlySeries of stock, bond and inflation returns"""
+    return _HIST
+
+
+def _simulate_paths_bootstrap_inflation(stock_growth, bond_growth, inflation_growth, bootstrap_idx, initial_portfolio,
+                                        initial_withdrawal, stock_allocations, bond_allocations):
+    """
+    Simulate each bootstrapped path month by month, adjusting withdrawals by each
+    year's bootstrapped inflation (compiled with Numba when available)
+
+    Every allocation replays the same bootstrapped paths. Returns (allocations, simulations)
+    arrays of final portfolio values and the month each path failed (-1 if it survived).
+    """
+    num_simulations, total_months = bootstrap_idx.shape
+    num_allocations = len(stock_allocations)
+    final_portfolio = np.empty((num_allocations, num_simulations), dtype=np.float32)
+    failure_month = np.full((num_allocations, num_simulations), -1, dtype=np.int32)
+
+    for path in prange(num_allocations * num_simulations):
+        alloc = path // num_simulations
+        sim = path % num_simulations
+        stock_allocation = stock_allocations[alloc]
+        bond_allocation = bond_allocations[alloc]
+
+        portfolio = initial_portfolio
+        monthly_withdrawal = initial_withdrawal
+        annual_inflation_multiplier = 1.0  # Track compounded inflation over the year
+
+        for month in range(total_months):
+            random_month_idx = bootstrap_idx[sim, month]
+
+            # Accumulate inflation throughout the year
+            annual_inflation_multiplier *= inflation_growth[random_month_idx]
+
+            # Apply returns to portfolio, then withdraw (inflation-adjusted)
+            portfolio = portfolio * (stock_allocation * stock_growth[random_month_idx] +
+                                     bond_allocation * bond_growth[random_month_idx])
+            portfolio -= monthly_withdrawal
+
+            # Adjust withdrawal for inflation (annually)
+            if (month + 1) % 12 == 0:
+                monthly_withdrawal *= annual_inflation_multiplier
+                annual_inflation_multiplier = 1.0  # Reset for next year
+
+            # Check for failure
+            if portfolio <= 0:
+                failure_month[alloc, sim] = month
+                break
+
+        final_portfolio[alloc, sim] = portfolio
+
+    return final_portfolio, failure_month
+
+
+def _simulate_paths_fixed_inflation(stock_growth, bond_growth, bootstrap_idx, initial_portfolio, initial_withdrawal,
+                                    stock_allocations, bond_allocations, fixed_inflation_growth):
+    """
+    Same as _simulate_paths_bootstrap_inflation, but with a fixed annual inflation rate,
+    so the historical inflation series is never read
+    """
+    num_simulations, total_months = bootstrap_idx.shape
+    num_allocations = len(stock_allocations)
+    final_portfolio = np.empty((num_allocations, num_simulations), dtype=np.float32)
+    failure_month = np.full((num_allocations, num_simulations), -1, dtype=np.int32)
+
+    for path in prange(num_allocations * num_simulations):
+        alloc = path // num_simulations
+        sim = path % num_simulations
+        stock_allocation = stock_allocations[alloc]
+        bond_allocation = bond_allocations[alloc]
+
+        portfolio = initial_portfolio
+        monthly_withdrawal = initial_withdrawal
+
+        for month in range(total_months):
+            random_month_idx = bootstrap_idx[sim, month]
+
+            # Apply returns to portfolio, then withdraw (inflation-adjusted)
+            portfolio = portfolio * (stock_allocation * stock_growth[random_month_idx] +
+                                     bond_allocation * bond_growth[random_month_idx])
+            portfolio -= monthly_withdrawal
+
+            # Adjust withdrawal for inflation (annually)
+            if (month + 1) % 12 == 0:
+                monthly_withdrawal *= fixed_inflation_growth
+
+            # Check for failure
+            if portfolio <= 0:
+                failure_month[alloc, sim] = month
+                break
+
+        final_portfolio[alloc, sim] = portfolio
+
+    return final_portfolio, failure_month
+
+
+def _simulate_paths_numpy(stock_growth, bond_growth, inflation_growth, bootstrap_idx, initial_portfolio, initial_withdrawal,
+                          stock_allocations, bond_allocations, use_bootstrap_inflation, fixed_inflation_growth):
+    """Vectorized NumPy equivalent of the Numba kernels, used when Numba is unavailable
+
+    Steps a whole year at a time: with the withdrawal constant within a year, twelve
+    monthly updates collapse to portfolio * G - withdrawal * S, where G is the year's
+    compounded growth and S sums the growth left after each month's withdrawal. The
+    paths must therefore span whole years.
+    """
+    num_simulations, total_months = bootstrap_idx.shape
+    shape = (len(stock_allocations), num_simulations)
+
+    # (allocations, 2) stock/bond weights; each year's blended monthly growth is one batched
+    # matrix product with the (12, 2, simulations) gathered growth factors
+    allocation_weights = np.stack([stock_allocations, bond_allocations], axis=1).astype(np.float32)
+    month_growth = np.empty((12, 2, num_simulations), dtype=np.float32)
+    growth = np.empty((12, *shape), dtype=np.float32)
+
+    # Month-major indices so each year's gather reads contiguous rows
+    bootstrap_idx = np.ascontiguousarray(bootstrap_idx.T)
+
+    # Portfolio state per (allocation, simulation); withdrawals only depend on the path
+    portfolio = np.full(shape, initial_portfolio, dtype=np.float32)
+    monthly_withdrawal = np.full(num_simulations, initial_withdrawal, dtype=np.float32)
+    alive = np.ones(shape, dtype=bool)
+    path_failure_month = np.full(shape, -1, dtype=np.int32)
+
+    # Results in original path order, filled in as paths are dropped from the simulation
+    final_portfolio = np.empty(shape, dtype=np.float32)
+    failure_month = np.empty(shape, dtype=np.int32)
+    paths = np.arange(num_simulations)  # Original column of each path still being simulated
+
+    for year in range(total_months // 12):
+        # One gather per series per year, shared by every allocation
+        year_idx = bootstrap_idx[year * 12:(year + 1) * 12]
+        np.take(stock_growth, year_idx, out=month_growth[:, 0])
+        np.take(bond_growth, year_idx, out=month_growth[:, 1])
+        np.matmul(allocation_weights, month_growth, out=growth)
+
+        # Growth over the whole year, and over the months after each withdrawal
+        year_growth = growth[0].copy()
+        withdrawal_factor = np.ones_like(year_growth)
+        for month in range(1, 12):
+            year_growth *= growth[month]
+            withdrawal_factor *= growth[month]
+            withdrawal_factor += 1
+
+        # Apply returns and (inflation-adjusted) withdrawals for all 12 months
+        start_portfolio = portfolio
+        portfolio = portfolio * year_growth - monthly_withdrawal * withdrawal_factor
+
+        # Check for failure. Growth factors are positive, so a depleted portfolio stays
+        # depleted and only paths that end the year at or below zero can have failed in it
+        newly_failed = alive & (portfolio <= 0)
+        if newly_failed.any():
+            # Replay those paths month by month to find the first month they ran out
+            failed_portfolio = start_portfolio[newly_failed]
+            failed_growth = growth[:, newly_failed]
+            failed_withdrawal = np.broadcast_to(monthly_withdrawal, portfolio.shape)[newly_failed]
+            depleted = np.empty(failed_growth.shape, dtype=bool)
+            for month in range(12):
+                failed_portfolio = failed_portfolio * failed_growth[month] - failed_withdrawal
+                depleted[month] = failed_portfolio <= 0
+            # Rounding can leave the monthly replay just short of zero; count it as the last month
+            depleted[-1] = True
+            path_failure_month[newly_failed] = year * 12 + depleted.argmax(axis=0)
+            alive &= ~newly_failed
+
+        # Adjust withdrawal for inflation (annually)
+        if use_bootstrap_inflation:
+            # Use compounded inflation from bootstrapped data over the past 12 months
+            monthly_withdrawal *= inflation_growth[year_idx].prod(axis=0)
+        else:
+            # Use fixed annual inflation rate
+            monthly_withdrawal *= fixed_inflation_growth
+
+        # Every two years, stop simulating paths that have failed under every allocation
+        # once they make up at least half of the remaining paths
+        if (year + 1) % 2 == 0:
+            active = alive.any(axis=0)
+            if active.sum() <= len(paths) // 2:
+                dropped = paths[~active]
+                final_portfolio[:, dropped] = portfolio[:, ~active]
+                failure_month[:, dropped] = path_failure_month[:, ~active]
+
+                paths = paths[active]
+                bootstrap_idx = bootstrap_idx[:, active]
+                portfolio = portfolio[:, active]
+                monthly_withdrawal = monthly_withdrawal[active]
+                alive = alive[:, active]
+                path_failure_month = path_failure_month[:, active]
+                month_growth = np.empty((12, 2, len(paths)), dtype=np.float32)
+                growth = np.empty((12, *portfolio.shape), dtype=np.float32)
+
+    # Failed paths keep being updated until they're dropped, so only survivors'
+    # final values are meaningful
+    final_portfolio[:, paths] = portfolio
+    failure_month[:, paths] = path_failure_month
+
+    return final_portfolio, failure_month
+
+
+def _select_simulate_paths():
+    """Compile the simulation kernel with Numba and warm it up, falling back to NumPy"""
+    if njit is None:
+        return _simulate_paths_numpy
+
+    # The on-disk cache can't always be written or reloaded (e.g. a read-only install),
+    # so retry with an in-memory compile before giving up on Numba
+    for cache in (True, False):
+        try:
+            jit = njit(parallel=True, fastmath=True, cache=cache)
+            bootstrap_inflation_kernel = jit(_simulate_paths_bootstrap_inflation)
+            fixed_inflation_kernel = jit(_simulate_paths_fixed_inflation)
+
+            # Trigger compilation now so the first request doesn't pay for it
+            warmup_idx = np.zeros((2, 12), dtype=np.int32)
+            bootstrap_inflation_kernel(*_HIST_GROWTH, warmup_idx, 1.0, 0.01, np.array([0.5]), np.array([0.5]))
+            fixed_inflation_kernel(_HIST_GROWTH.sp500, _HIST_GROWTH.bond, warmup_idx, 1.0, 0.01,
+                                   np.array([0.5]), np.array([0.5]), 1.0)
+            break
+        except Exception as e:
+            logger.warning("Numba compile failed (cache=%s): %s", cache, e)
+    else:
+        logger.warning("Falling back to the NumPy simulation kernel")
+        return _simulate_paths_numpy
+
+    def simulate_paths(stock_growth, bond_growth, inflation_growth, bootstrap_idx, initial_portfolio, initial_withdrawal,
+                       stock_allocations, bond_allocations, use_bootstrap_inflation, fixed_inflation_growth):
+        # Pick the kernel up front so the inflation mode isn't branched on every month
+        if use_bootstrap_inflation:
+            return bootstrap_inflation_kernel(stock_growth, bond_growth, inflation_growth, bootstrap_idx,
+                                              initial_portfolio, initial_withdrawal, stock_allocations, bond_allocations)
+        return fixed_inflation_kernel(stock_growth, bond_growth, bootstrap_idx, initial_portfolio, initial_withdrawal,
+                                      stock_allocations, bond_allocations, fixed_inflation_growth)
+
+    return simulate_paths
+
+
+_simulate_paths = _select_simulate_paths()
+
+
+def _draw_bootstrap_indices(years, num_simulations, seed=None):
+    """Randomly select the historical month used for every simulated month (bootstrap)"""
+    rng = np.random.default_rng(seed)
+    return rng.integers(0, len(load_historical_data().sp500), size=(num_simulations, years * 12), dtype=np.int32)
+
+
+def _simulate_allocations(withdrawal_rate, inflation_input, stock_allocations, bond_allocations, bootstrap_idx):
+    """
+    Run one set of bootstrapped paths (one row of month indices per simulation) for
+    every stock/bond allocation
+
+    Returns (allocations, simulations) arrays of final portfolio values and failure months.
+    """
+
+    # Use the fixed annual inflation rate if provided, applied as one growth factor per year
+    if inflation_input is not None:
+        fixed_inflation_growth = 1 + inflation_input / 100
+        use_bootstrap_inflation = False
+    else:
+        fixed_inflation_growth = 1.0
+        use_bootstrap_inflation = True
+
+    # Initial portfolio value (arbitrary - math is scale-invariant)
+    initial_portfolio = 1_000_000
+
+    final_portfolio, failure_month = _simulate_paths(
+        *_HIST_GROWTH,
+        bootstrap_idx,
+        float(initial_portfolio),
+        initial_portfolio * withdrawal_rate / 12,
+        np.asarray(stock_allocations, dtype=np.float64),
+        np.asarray(bond_allocations, dtype=np.float64),
+        use_bootstrap_inflation,
+        float(fixed_inflation_growth)
+    )
+
+    return final_portfolio, failure_month
+
+
+def _summarize_allocations(final_portfolio, failure_month, inflation_input):
+    """Build a run_monte_carlo-style result dictionary for each allocation's simulated paths"""
+    num_simulations = failure_month.shape[1]
+
+    # Calculate statistics for every allocation at once, reducing over the simulation axis
+    alive = failure_month < 0
+    successes = alive.sum(axis=1)
+    failures = num_simulations - successes
+
+    # Reduce in float64 even though the simulation state is float32
+    total_final_portfolio = np.where(alive, final_portfolio, 0).sum(axis=1, dtype=np.float64)
+
+    # Survivors (failure month -1) sort first, so each allocation's failure months are the
+    # last `failures` entries of its sorted row and their median sits at a known position
+    sorted_failure_month = np.sort(failure_month, axis=1)
+    rows = np.arange(len(failure_month))
+    median_lower = np.minimum(successes + (failures - 1) // 2, num_simulations - 1)
+    median_upper = np.minimum(successes + failures // 2, num_simulations - 1)
+    median_failure_month = (sorted_failure_month[rows, median_lower] + sorted_failure_month[rows, median_upper]) / 2
+
+    results = []
+    for alloc in rows:
+        alloc_successes = int(successes[alloc])
+        alloc_failures = int(failures[alloc])
+        success_rate = (alloc_successes / num_simulations) * 100
+
+        avg_final_portfolio = float(total_final_portfolio[alloc] / alloc_successes) if alloc_successes else 0
+        median_years_to_failure = float(median_failure_month[alloc] / 12) if alloc_failures else None
+
+        results.append({
+            'successRate': round(success_rate, 1),
+            'totalSimulations': num_simulations,
+            'successes': alloc_successes,
+            'failures': alloc_failures,
+            'details': {
+                'avgFinalPortfolio': round(avg_final_portfolio, 0),
+                'medianYearsToFailure': round(median_years_to_failure, 1) if median_years_to_failure else None,
+                'usedBootstrap': inflation_input is None
+            }
+        })
+
+    return results
+
+
+def _success_rate_half_width(successes, num_simulations, z=1.96):
+    """Half-width of the Wilson score confidence interval (95% by default) for a success rate"""
+    p_hat = successes / num_simulations
+    z2_n = z * z / num_simulations
+    return z * np.sqrt(p_hat * (1 - p_hat) / num_simulations + z2_n / (4 * num_simulations)) / (1 + z2_n)
+
+
+# Simulations run per batch when stopping early at a requested precision
+SEQUENTIAL_BATCH_SIZE = 128
+
+
+def run_monte_carlo(years, withdrawal_rate, inflation_input, stock_allocation, bond_allocation, num_simulations=1000,
+                    bootstrap_idx=None, seed=None, precision=None):
+    """
+    Run Monte Carlo simulation using historical bootstrap
+
+    Parameters:
+    - years: Number of years in retirement
+    - withdrawal_rate: Initial withdrawal as % of portfolio (decimal, e.g., 0.05)
+    - inflation_input: Fixed annual inflation rate (decimal) or None for bootstrap
+    - stock_allocation: % in stocks (decimal, e.g., 0.70)
+    - bond_allocation: % in bonds (decimal, e.g., 0.30)
+    - num_simulations: Number of Monte Carlo iterations (default 100)
+    - bootstrap_idx: Optional (num_simulations, years * 12) array of historical month
+      indices, so several calls can be compared over the same paths (common random numbers)
+    - seed: Optional random seed for reproducible bootstrap draws (ignored with bootstrap_idx)
+    - precision: Optional target 95% confidence half-width of the success rate (decimal,
+      e.g., 0.01 for ±1%). Simulations then run in batches of 128 and stop as soon as the
+      target is met, so fewer than num_simulations may be run
+
+    Returns:
+    - Dictionary with success rate and statistics
+    """
+
+    if bootstrap_idx is not None:
+        # The NumPy kernel steps whole years, so a partial final year would be skipped by it
+        # but simulated by the Numba kernels; require exactly `years` of months per path
+        bootstrap_idx = np.asarray(bootstrap_idx)
+        if bootstrap_idx.ndim != 2 or bootstrap_idx.shape[1] != years * 12:
+            raise ValueError(f"bootstrap_idx must have shape (num_simulations, {years * 12}), got {bootstrap_idx.shape}")
+        num_simulations = len(bootstrap_idx)
+    rng = np.random.default_rng(seed)
+    batch_size = num_simulations if precision is None else SEQUENTIAL_BATCH_SIZE
+
+    final_batches = []
+    failure_batches = []
+    simulated = successes = 0
+    while simulated < num_simulations:
+        batch = min(batch_size, num_simulations - simulated)
+        if bootstrap_idx is not None:
+            batch_idx = bootstrap_idx[simulated:simulated + batch]
+        else:
+            batch_idx = _draw_bootstrap_indices(years, batch, rng)
+
+        final_portfolio, failure_month = _simulate_allocations(
+            withdrawal_rate=withdrawal_rate,
+            inflation_input=inflation_input,
+            stock_allocations=[stock_allocation],
+            bond_allocations=[bond_allocation],
+            bootstrap_idx=batch_idx
+        )
+        final_batches.append(final_portfolio)
+        failure_batches.append(failure_month)
+        simulated += batch
+        successes += int((failure_month < 0).sum())
+
+        # Stop once the success rate is known precisely enough
+        if precision is not None and _success_rate_half_width(successes, simulated) < precision:
+            break
+
+    return _summarize_allocations(
+        np.concatenate(final_batches, axis=1),
+        np.concatenate(failure_batches, axis=1),
+        inflation_input
+    )[0]
+
+
+def run_historical_stress_test(years, withdrawal_rate, stock_allocation, bond_allocation):
+    """
+    Run a deterministic historical simulation starting March 2000
+
+    This simulates retiring at the dot-com bubble peak (March 24, 2000 was the
+    historical S&P 500 peak) using actual historical data from March 2000 through
+    December 2024.
+
+    March 2000 - March 2010 saw only +2.81% total return (+0.28% annualized),
+    including both the dot-com crash (2000-2002) and the financial crisis (2008-2009).
+
+    Parameters:
+    - years: Number of years in retirement (if ≤24, stop at Mar 2024; if ≥25, stop at Dec 2024)
+    - withdrawal_rate: Annual withdrawal as % of portfolio (decimal)
+    - stock_allocation: % in stocks (decimal)
+    - bond_allocation: % in bonds (decimal)
+
+    Returns:
+    - Dictionary with year-by-year portfolio values
+    """
+
+    # Load historical data
+    historical_data = load_historical_data()
+
+    # Stress test configuration: March 2000 (dot-com bubble peak)
+    start_year = 2000
+    start_month = 3  # March
+    start_day = 31
+    anniversary_month = 3  # Record values every March
+
+    start_date = np.datetime64(f'{start_year}-{start_month:02d}-{start_day}')
+
+    # Historical months from the start date onwards (dates are sorted)
+    start_idx = np.searchsorted(_HIST_DATES, start_date)
+    subset_dates = _HIST_DATES[start_idx:]
+    subset_sp500 = historical_data.sp500[start_idx:]
+    subset_bond = historical_data.bond[start_idx:]
+    subset_infl = historical_data.infl[start_idx:]
+    num_subset_months = len(subset_dates)
+
+    # Blend the portfolio's monthly growth factor for the whole period at once, so the
+    # month loop below only applies one factor and one withdrawal per month
+    portfolio_growth = (stock_allocation * (1 + subset_sp500.astype(np.float64)) +
+                        bond_allocation * (1 + subset_bond.astype(np.float64))).tolist()
+    inflation_growth = (1 + subset_infl.astype(np.float64)).tolist()
+    month_dates = subset_dates.tolist()  # datetime.date per month
+
+    # Determine end date based on years (24 years from March 2000 = March 2024)
+    years_from_start = 2024 - start_year  # 24 years available
+    if years <= years_from_start:
+        # Stop at anniversary month in final year
+        max_months = years * 12
+        end_year = start_year + years
+        end_month = anniversary_month
+    else:
+        # Stop at December 2024
+        max_months = min(years * 12, num_subset_months)
+        end_year = 2024
+        end_month = 12
+
+    # Initial portfolio
+    initial_portfolio = 1_000_000
+    portfolio = initial_portfolio
+    monthly_withdrawal = initial_portfolio * withdrawal_rate / 12
+    annual_inflation_multiplier = 1.0  # Track compounded inflation over the year
+
+    # Track results by year (October to October, then final Dec 2024)
+    yearly_results = []
+    failed = False
+    failure_year = None
+
+    # Add starting value
+    start_date_str = start_date.astype(object).strftime('%B %Y')
+    yearly_results.append({
+        'date': start_date_str,
+        'portfolioValue': initial_portfolio,
+        'year': start_year
+    })
+
+    # Run simulation month by month
+    for month_idx in range(min(max_months, num_subset_months)):
+        current_date = month_dates[month_idx]
+
+        # Accumulate inflation throughout the year
+        annual_inflation_multiplier *= inflation_growth[month_idx]
+
+        # Apply returns to portfolio
+        portfolio *= portfolio_growth[month_idx]
+
+        # Withdraw
+        portfolio -= monthly_withdrawal
+
+        # Adjust withdrawal for inflation (annually)
+        if (month_idx + 1) % 12 == 0:
+            # Apply the inflation compounded over the past 12 months
+            monthly_withdrawal *= annual_inflation_multiplier
+            annual_inflation_multiplier = 1.0  # Reset for next year
+
+        # Check for failure
+        if portfolio <= 0:
+            failed = True
+            failure_year = current_date.year
+            break
+
+        # Record anniversary month values each year (skip the starting year)
+        if current_date.month == anniversary_month and current_date.year > start_year:
+            yearly_results.append({
+                'date': f"{current_date.strftime('%B')} {current_date.year}",
+                'portfolioValue': portfolio,
+                'year': current_date.year
+            })
+
+    # Add final December 2024 value if portfolio still exists and years exceed available history
+    if not failed and years > years_from_start:
+        # Continue to December 2024
+        dec_2024_months = np.searchsorted(subset_dates, np.datetime64('2024-12-31'), side='right')
+        remaining_months = dec_2024_months - max_months
+
+        for month_idx in range(max_months, dec_2024_months):
+            annual_inflation_multiplier *= inflation_growth[month_idx]
+            portfolio *= portfolio_growth[month_idx]
+            portfolio -= monthly_withdrawal
+
+            if (month_idx + 1) % 12 == 0:
+                monthly_withdrawal *= annual_inflation_multiplier
+                annual_inflation_multiplier = 1.0
+
+            if portfolio <= 0:
+                failed = True
+                failure_year = month_dates[month_idx].year
+                break
+
+        if not failed:
+            yearly_results.append({
+                'date': 'December 2024',
+                'portfolioValue': portfolio,
+                'year': 2024
+            })
+
+    return {
+        'type': 'historicalStressTest',
+        'startDate': start_date_str,
+        'yearsSimulated': years,
+        'initialPortfolio': initial_portfolio,
+        'stockAllocation': stock_allocation * 100,
+        'bondAllocation': bond_allocation * 100,
+        'withdrawalRate': withdrawal_rate * 100,
+        'failed': failed,
+        'failureYear': failure_year,
+        'yearlyResults': yearly_results
+    }
+
+
+def find_optimal_historical_allocation(years, withdrawal_rate):
+    """
+    Find the optimal allocation for the March 2000 stress test scenario
+
+    Tests all allocations from 0% to 100% stocks in 10% increments using
+    deterministic historical data from March 2000 onwards.
+
+    Returns the allocation with the highest final portfolio value (or lowest
+    failure year if all fail).
+    """
+
+    best_allocation = None
+    best_final_value = -1
+    best_survived_longest = 0
+    all_results = []
+
+    # Test each allocation from 0% to 100% stocks
+    for stock_pct in range(0, 101, 10):
+        stock_allocation = stock_pct / 100
+        bond_allocation = (100 - stock_pct) / 100
+
+        result = run_historical_stress_test(
+            years=years,
+            withdrawal_rate=withdrawal_rate,
+            stock_allocation=stock_allocation,
+            bond_allocation=bond_allocation
+        )
+
+        all_results.append({
+            'stockPercent': stock_pct,
+            'bondPercent': 100 - stock_pct,
+            'failed': result['failed'],
+            'failureYear': result['failureYear'],
+            'finalValue': result['yearlyResults'][-1]['portfolioValue'] if not result['failed'] else 0,
+            'yearsSurvived': len(result['yearlyResults']) - 1  # Subtract starting year
+        })
+
+        # Determine if this is the best allocation
+        # Prioritize: 1) Not failing, 2) Highest final value among survivors
+        if not result['failed']:
+            final_value = result['yearlyResults'][-1]['portfolioValue']
+            if final_value > best_final_value:
+                best_final_value = final_value
+                best_allocation = {
+                    'stockPercent': stock_pct,
+                    'bondPercent': 100 - stock_pct,
+                    'result': result
+                }
+        elif best_allocation is None:
+            # First allocation (all fail case), set as baseline
+            best_allocation = {
+                'stockPercent': stock_pct,
+                'bondPercent': 100 - stock_pct,
+                'result': result
+            }
+        elif best_allocation['result']['failed'] and result['failed']:
+            # Both failed, pick the one that survived longest
+            years_survived = len(result['yearlyResults']) - 1
+            best_years = len(best_allocation['result']['yearlyResults']) - 1
+            if years_survived > best_years:
+                best_allocation = {
+                    'stockPercent': stock_pct,
+                    'bondPercent': 100 - stock_pct,
+                    'result': result
+                }
+
+    return {
+        'type': 'optimalHistoricalAllocation',
+        'optimalAllocation': best_allocation,
+        'allAllocations': all_results
+    }
+
+
+def run_allocation_sweep_analysis(years, withdrawal_rate, inflation_input, num_simulations=1000, seed=None):
+    """
+    Run Monte Carlo simulations across different stock/bond allocations
+
+    Tests allocations from 0% stocks to 100% stocks in 10% increments
+    (11 total combinations: 0/100, 10/90, 20/80, ... 100/0)
+
+    Pass a seed for reproducible bootstrap draws.
+
+    Returns:
+    - Array of results for each allocation
+    - Best allocation recommendation
+    """
+
+    allocations = []
+    results = []
+
+    # Test allocations from 0% to 100% stocks in 10% increments
+    stock_percents = list(range(0, 101, 10))
+
+    # Draw the bootstrapped paths once and reuse them for every allocation (common random
+    # numbers), so differences between allocations aren't masked by sampling noise
+    bootstrap_idx = _draw_bootstrap_indices(years, num_simulations, seed)
+
+    # Simulate every allocation at once over the same bootstrapped paths
+    final_portfolio, failure_month = _simulate_allocations(
+        withdrawal_rate=withdrawal_rate,
+        inflation_input=inflation_input,
+        stock_allocations=[stock_pct / 100 for stock_pct in stock_percents],
+        bond_allocations=[(100 - stock_pct) / 100 for stock_pct in stock_percents],
+        bootstrap_idx=bootstrap_idx
+    )
+    allocation_results = _summarize_allocations(final_portfolio, failure_month, inflation_input)
+
+    for stock_pct, result in zip(stock_percents, allocation_results):
+        allocations.append({
+            'stockPercent': stock_pct,
+            'bondPercent': 100 - stock_pct,
+            'successRate': result['successRate'],
+            'successes': result['successes'],
+            'failures': result['failures'],
+            'avgFinalPortfolio': result['details']['avgFinalPortfolio'],
+            'medianYearsToFailure': result['details']['medianYearsToFailure']
+        })
+
+        results.append(result['successRate'])
+
+    # Find best allocation (highest success rate)
+    best_idx = results.index(max(results))
+    best_allocation = allocations[best_idx]
+
+    return {
+        'type': 'allocationSweep',
+        'allocations': allocations,
+        'bestAllocation': {
+            'stockPercent': best_allocation['stockPercent'],
+            'bondPercent': best_allocation['bondPercent'],
+            'successRate': best_allocation['successRate']
+        },
+        'totalCombinations': len(allocations),
+        'simulationsPerCombination': num_simulations,
+        'totalSimulations': len(allocations) * num_simulations
+    }
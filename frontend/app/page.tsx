@@ -236,7 +236,7 @@ export default function Home() {
 
     try {
       // Call Monte Carlo API with allocation sweep
-      const response = await fetch('/api/monte-carlo', {
+      const response = await fetch('/api/monte_carlo', {
         method: 'POST',
         headers: {
           'Content-Type': 'application/json',
@@ -279,7 +279,7 @@ export default function Home() {
     try {
       // Run both the stress test with Monte Carlo best allocation AND find optimal March 2000 allocation
       const [stressResponse, optimalResponse] = await Promise.all([
-        fetch('/api/monte-carlo', {
+        fetch('/api/monte_carlo', {
           method: 'POST',
           headers: {
             'Content-Type': 'application/json',
@@ -292,7 +292,7 @@ export default function Home() {
             historicalStressTest: true,
           }),
         }),
-        fetch('/api/monte-carlo', {
+        fetch('/api/monte_carlo', {
           method: 'POST',
           headers: {
             'Content-Type': 'application/json',
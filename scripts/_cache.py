@@ -0,0 +1,73 @@
+"""
+On-disk cache for the download scripts
+
+Raw response bodies are stored under data/.cache/, keyed by a hash of the request
+URL, so re-running a script during development skips the network for series that
+only change monthly. Once a cached body expires it is revalidated with the server's
+ETag/Last-Modified validators, so an unchanged series costs a 304 instead of a
+full download.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import time
+
+import requests
+
+CACHE_DIR = 'data/.cache'
+
+
+def _write_atomic(path, data):
+    """Write bytes so an interrupted run never leaves a truncated cache entry"""
+    fd, tmp_path = tempfile.mkstemp(dir=CACHE_DIR)
+    with os.fdopen(fd, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+def cached_get(session, url, ttl_seconds, params=None, use_cache=True):
+    """
+    GET a URL through the on-disk cache and return the response body as bytes
+
+    A cached body younger than ttl_seconds is returned without a request; an older one
+    is revalidated with a conditional request. With use_cache=False the cache isn't
+    read, but the fresh download still replaces it.
+    """
+    full_url = requests.Request('GET', url, params=params).prepare().url
+    path = os.path.join(CACHE_DIR, hashlib.md5(full_url.encode()).hexdigest())
+    validators_path = path + '.json'
+    cached = use_cache and os.path.exists(path)
+
+    if cached and os.path.getmtime(path) > time.time() - ttl_seconds:
+        with open(path, 'rb') as f:
+            return f.read()
+
+    # Ask the server to skip the body if it hasn't changed since it was cached
+    headers = {}
+    if cached and os.path.exists(validators_path):
+        with open(validators_path) as f:
+            validators = json.load(f)
+        if validators.get('etag'):
+            headers['If-None-Match'] = validators['etag']
+        if validators.get('last_modified'):
+            headers['If-Modified-Since'] = validators['last_modified']
+
+    response = session.get(url, params=params, headers=headers, timeout=30)
+
+    if cached and response.status_code == 304:
+        os.utime(path)  # Still current, so restart its TTL
+        with open(path, 'rb') as f:
+            return f.read()
+
+    response.raise_for_status()
+
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    _write_atomic(path, response.content)
+    _write_atomic(validators_path, json.dumps({
+        'etag': response.headers.get('ETag'),
+        'last_modified': response.headers.get('Last-Modified')
+    }).encode())
+
+    return response.content
@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+"""
+Pre-parse monthly_returns.csv into .npy files for the Monte Carlo API
+
+The serverless function memory-maps these instead of parsing the CSV on every
+cold start. Re-run this script (from the frontend/ directory) whenever
+data/monthly_returns.csv changes:
+
+    python ../scripts/build_monthly_returns_npy.py
+
+Outputs:
+- data/monthly_returns.npy: float32 array of shape (3, months) holding the S&P 500,
+  5-Year Treasury and monthly inflation returns as decimals, one contiguous row per series
+- data/monthly_returns_dates.npy: datetime64[D] month-end date of each column
+"""
+
+import numpy as np
+
+INPUT_CSV = 'data/monthly_returns.csv'
+RETURNS_NPY = 'data/monthly_returns.npy'
+DATES_NPY = 'data/monthly_returns_dates.npy'
+
+# Same columns, order and conversion as the API's CSV loader
+RETURN_COLUMNS = ['SP500_Total_Return', 'Treasury_5Y_Total_Return', 'Inflation_Monthly']
+
+print(f"Reading {INPUT_CSV}...")
+
+with open(INPUT_CSV) as f:
+    columns = f.readline().strip().split(',')
+    rows = np.loadtxt(f, delimiter=',', dtype=str, ndmin=2)
+
+# Convert percentages to decimals
+returns = np.stack([
+    rows[:, columns.index(name)].astype(np.float64) / 100
+    for name in RETURN_COLUMNS
+]).astype(np.float32)
+dates = rows[:, columns.index('Date')].astype('datetime64[D]')
+
+np.save(RETURNS_NPY, returns)
+np.save(DATES_NPY, dates)
+
+print(f"✓ Saved {RETURNS_NPY} {returns.shape} {returns.dtype}")
+print(f"✓ Saved {DATES_NPY} ({dates[0]} to {dates[-1]})")
@@ -17,8 +17,23 @@ Date: October 7, 2025
 import pandas as pd
 import numpy as np
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from datetime import datetime
+import argparse
+import asyncio
+import csv
 import io
+import os
+
+from _cache import cached_get
+
+# pyarrow's CSV writer formats in native code; fall back to pandas without it
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pacsv
+except ImportError:
+    pa = None
 
 # Configuration
 START_DATE = '1965-01-01'
@@ -26,294 +41,313 @@ END_DATE = '2024-12-31'
 DURATION_5Y = 4.25  # Modified duration for 5-year Treasury
 DURATION_10Y = 8.5  # Modified duration for 10-year Treasury
 
-# Output file
+# Output files (the Parquet copy is only written when pyarrow is installed)
 OUTPUT_CSV = 'data/historical_returns_1965_2024.csv'
+OUTPUT_PARQUET = 'data/historical_returns_1965_2024.parquet'
 METADATA_FILE = 'data/historical_returns_metadata.txt'
 
-print("=" * 80)
-print("DOWNLOADING HISTORICAL MARKET DATA (1965-2024)")
-print("=" * 80)
-
-# ============================================================================
-# 1. Download S&P 500 Total Return Data from Robert Shiller
-# ============================================================================
-print("\n[1/4] Downloading S&P 500 Total Return data from Robert Shiller...")
-
-shiller_url = 'http://www.econ.yale.edu/~shiller/data/ie_data.xls'
-
-try:
-    response = requests.get(shiller_url, timeout=30)
-    response.raise_for_status()
-
-    # Read Excel file (Shiller's data starts at row 7)
-    # Try xlrd engine first for .xls format
-    try:
-        shiller_df = pd.read_excel(io.BytesIO(response.content), sheet_name='Data', engine='xlrd', skiprows=7, nrows=2000)
-    except:
-        # Fallback to openpyxl for .xlsx
-        shiller_df = pd.read_excel(io.BytesIO(response.content), engine='openpyxl', skiprows=7, nrows=2000)
-
-    # Get actual column names from first row
-    print(f"  Shiller columns ({len(shiller_df.columns)}): {list(shiller_df.columns[:5])}...")
-
-    # Use the actual column names (first 3 columns are Date, Price, Dividend)
-    date_col = shiller_df.columns[0]
-    price_col = shiller_df.columns[1]
-    dividend_col = shiller_df.columns[2]
-
-    # Keep only necessary columns
-    shiller_df = shiller_df[[date_col, price_col, dividend_col]].copy()
-    shiller_df.columns = ['Date', 'SP500_Price', 'Dividend']
-
-    # Convert Date to datetime (format: YYYY.MM)
-    shiller_df['Date'] = pd.to_datetime(shiller_df['Date'].astype(str).str.replace('.', '-'), format='%Y-%m', errors='coerce')
-
-    # Filter to our date range
-    shiller_df = shiller_df[(shiller_df['Date'] >= START_DATE) & (shiller_df['Date'] <= END_DATE)]
-
-    # Calculate monthly returns from price and dividend data
-    # Total Return = (Price[t] + Dividend[t]) / Price[t-1] - 1
-    shiller_df = shiller_df.sort_values('Date')
-    shiller_df['SP500_Monthly_Return'] = (
-        (shiller_df['SP500_Price'] + shiller_df['Dividend']) /
-        shiller_df['SP500_Price'].shift(1) - 1
+# Data sources
+SHILLER_URL = 'http://www.econ.yale.edu/~shiller/data/ie_data.xls'
+FRED_URL = 'https://fred.stlouisfed.org/graph/fredgraph.csv?id={series_id}'
+
+# FRED series to download: (series ID, column name, description)
+FRED_SERIES = [
+    ('DGS5', 'DGS5', '5-Year Treasury yield'),
+    ('DGS10', 'DGS10', '10-Year Treasury yield'),
+    ('CPIAUCSL', 'CPI', 'CPI inflation'),
+]
+
+# How long a cached download is reused (FRED updates daily, Shiller roughly monthly)
+FRED_CACHE_TTL = 24 * 60 * 60
+SHILLER_CACHE_TTL = 30 * 24 * 60 * 60
+
+# One pooled session so requests to the same host (three to FRED) reuse connections
+SESSION = requests.Session()
+_adapter = HTTPAdapter(pool_connections=4, pool_maxsize=8, max_retries=Retry(total=3, backoff_factor=0.3))
+SESSION.mount('https://', _adapter)
+SESSION.mount('http://', _adapter)
+
+# Ask for compressed CSVs (requests decompresses them transparently) and identify the script
+SESSION.headers.update({'Accept-Encoding': 'gzip, deflate', 'User-Agent': 'retirement-planning-downloader/1.0'})
+
+
+def fred_month_end(body):
+    """
+    Parse a daily or monthly FRED CSV into its end-of-month values
+
+    Keeps the last valid observation of each month while streaming the rows, then
+    forward fills months without one. Returns a Series indexed by month-end date.
+    """
+    reader = csv.reader(io.StringIO(body.decode()))
+    next(reader)  # Header
+
+    # Later rows of a month overwrite earlier ones; FRED marks missing values with '.'
+    month_values = {}
+    for date, value in reader:
+        if value not in ('.', ''):
+            month_values[date[:7]] = float(value)
+
+    month_ends = pd.to_datetime(list(month_values)) + pd.offsets.MonthEnd(0)
+    series = pd.Series(list(month_values.values()), index=month_ends)
+    return series.reindex(pd.date_range(month_ends[0], month_ends[-1], freq='ME')).ffill()
+
+
+def pct_change(values, periods=1):
+    """Percent change over the given number of periods; the first periods entries are NaN"""
+    values = np.asarray(values, dtype=np.float64)
+    change = np.full_like(values, np.nan)
+    change[periods:] = values[periods:] / values[:-periods] - 1
+    return change
+
+
+def yields_to_returns(yields_pct, duration):
+    """
+    Convert monthly yields (in percent) to total returns with the modified duration approximation
+
+    Total Return = (Yield / 12) - (Duration × Yield_Change); the first month has no change and is NaN.
+    """
+    yields = np.asarray(yields_pct, dtype=np.float64) / 100
+    returns = yields / 12
+    returns[1:] -= duration * (yields[1:] - yields[:-1])
+    returns[0] = np.nan
+    return returns
+
+
+def write_csv(df, path):
+    """Write a DataFrame as CSV with floats rounded to 6 decimals and dates as YYYY-MM-DD"""
+    if pa is None:
+        df.to_csv(path, index=False, float_format='%.6f')
+        return
+
+    # Round once up front instead of formatting every cell with a printf pattern
+    df = df.round(6)
+    for col in df.select_dtypes('datetime').columns:
+        df[col] = df[col].dt.date
+
+    # Write the header ourselves, as pyarrow quotes column names
+    with open(path, 'wb') as f:
+        f.write((','.join(df.columns) + '\n').encode())
+        pacsv.write_csv(pa.Table.from_pandas(df, preserve_index=False), f,
+                        write_options=pacsv.WriteOptions(include_header=False, quoting_style='none'))
+
+
+def coverage(series):
+    """First and last date with data in a date-indexed Series, or N/A for both if none (or no Series)"""
+    start = series.first_valid_index() if series is not None else None
+    if start is None:
+        return 'N/A', 'N/A'
+    return start, series.last_valid_index()
+
+
+async def fetch_all(sources, use_cache=True):
+    """
+    Download (url, cache TTL) sources concurrently
+
+    Failed downloads come back as their exception, which each process_* step reports.
+    """
+    return await asyncio.gather(
+        *(asyncio.to_thread(cached_get, SESSION, url, ttl_seconds, use_cache=use_cache) for url, ttl_seconds in sources),
+        return_exceptions=True
     )
 
-    # Keep only Date and Return
-    sp500_data = shiller_df[['Date', 'SP500_Monthly_Return']].copy()
-    sp500_data = sp500_data.dropna()
-
-    print(f"✓ Downloaded {len(sp500_data)} months of S&P 500 data")
-    print(f"  Date range: {sp500_data['Date'].min()} to {sp500_data['Date'].max()}")
-
-except Exception as e:
-    print(f"✗ Error downloading Shiller data: {e}")
-    print("  Please download manually from http://www.econ.yale.edu/~shiller/data.htm")
-    sp500_data = None
 
 # ============================================================================
-# 2. Download 5-Year Treasury Yield from FRED
+# 1. Download S&P 500 Total Return Data from Robert Shiller
 # ============================================================================
-print("\n[2/4] Downloading 5-Year Treasury yield data from FRED...")
-
-fred_5y_url = 'https://fred.stlouisfed.org/graph/fredgraph.csv?id=DGS5'
-
-try:
-    response = requests.get(fred_5y_url, timeout=30)
-    response.raise_for_status()
-
-    treasury_5y_df = pd.read_csv(io.StringIO(response.text))
-    treasury_5y_df.columns = ['Date', 'DGS5']
-    treasury_5y_df['Date'] = pd.to_datetime(treasury_5y_df['Date'])
+def process_shiller(body):
+    """Monthly S&P 500 total returns from Shiller's spreadsheet, or None if unavailable"""
+    print("\n[1/4] Processing S&P 500 Total Return data from Robert Shiller...")
 
-    # Convert to numeric, handle missing values
-    treasury_5y_df['DGS5'] = pd.to_numeric(treasury_5y_df['DGS5'], errors='coerce')
-
-    # Get end-of-month values
-    treasury_5y_df = treasury_5y_df.set_index('Date')
-    treasury_5y_monthly = treasury_5y_df.resample('ME').last()
-
-    # Forward fill missing values (holidays/weekends)
-    treasury_5y_monthly['DGS5'] = treasury_5y_monthly['DGS5'].ffill()
-
-    # Filter to date range
-    treasury_5y_monthly = treasury_5y_monthly[
-        (treasury_5y_monthly.index >= START_DATE) &
-        (treasury_5y_monthly.index <= END_DATE)
-    ]
+    try:
+        if isinstance(body, Exception):
+            raise body
 
-    print(f"✓ Downloaded {len(treasury_5y_monthly)} months of 5-Year Treasury yield data")
-    print(f"  Date range: {treasury_5y_monthly.index.min()} to {treasury_5y_monthly.index.max()}")
+        # Read Excel file (Shiller's data starts at row 7)
+        # Try xlrd engine first for .xls format
+        try:
+            shiller_df = pd.read_excel(io.BytesIO(body), sheet_name='Data', engine='xlrd', skiprows=7, nrows=2000)
+        except:
+            # Fallback to openpyxl for .xlsx
+            shiller_df = pd.read_excel(io.BytesIO(body), engine='openpyxl', skiprows=7, nrows=2000)
 
-except Exception as e:
-    print(f"✗ Error downloading 5-Year Treasury data: {e}")
-    treasury_5y_monthly = None
+        # Get actual column names from first row
+        print(f"  Shiller columns ({len(shiller_df.columns)}): {list(shiller_df.columns[:5])}...")
 
-# ============================================================================
-# 3. Download 10-Year Treasury Yield from FRED
-# ============================================================================
-print("\n[3/4] Downloading 10-Year Treasury yield data from FRED...")
+        # Use the actual column names (first 3 columns are Date, Price, Dividend)
+        date_col = shiller_df.columns[0]
+        price_col = shiller_df.columns[1]
+        dividend_col = shiller_df.columns[2]
 
-fred_10y_url = 'https://fred.stlouisfed.org/graph/fredgraph.csv?id=DGS10'
+        # Keep only necessary columns
+        shiller_df = shiller_df[[date_col, price_col, dividend_col]].copy()
+        shiller_df.columns = ['Date', 'SP500_Price', 'Dividend']
 
-try:
-    response = requests.get(fred_10y_url, timeout=30)
-    response.raise_for_status()
+        # Convert Date to datetime (format: YYYY.MM, stored as a float so October reads 1965.1),
+        # dated to month end like the FRED series it is combined with
+        months = pd.to_numeric(shiller_df['Date'], errors='coerce').map('{:.2f}'.format)
+        shiller_df['Date'] = pd.to_datetime(months, format='%Y.%m', errors='coerce') + pd.offsets.MonthEnd(0)
 
-    treasury_10y_df = pd.read_csv(io.StringIO(response.text))
-    treasury_10y_df.columns = ['Date', 'DGS10']
-    treasury_10y_df['Date'] = pd.to_datetime(treasury_10y_df['Date'])
+        # Drop rows without a parseable date (the combined table picks out our date range)
+        shiller_df = shiller_df.dropna(subset=['Date'])
 
-    # Convert to numeric, handle missing values
-    treasury_10y_df['DGS10'] = pd.to_numeric(treasury_10y_df['DGS10'], errors='coerce')
+        # Calculate monthly returns from price and dividend data
+        # Total Return = (Price[t] + Dividend[t]) / Price[t-1] - 1
+        shiller_df = shiller_df.sort_values('Date')
+        shiller_df['SP500_Monthly_Return'] = (
+            (shiller_df['SP500_Price'] + shiller_df['Dividend']) /
+            shiller_df['SP500_Price'].shift(1) - 1
+        )
 
-    # Get end-of-month values
-    treasury_10y_df = treasury_10y_df.set_index('Date')
-    treasury_10y_monthly = treasury_10y_df.resample('ME').last()
+        # Keep only Date and Return
+        sp500_data = shiller_df[['Date', 'SP500_Monthly_Return']].copy()
+        sp500_data = sp500_data.dropna()
 
-    # Forward fill missing values
-    treasury_10y_monthly['DGS10'] = treasury_10y_monthly['DGS10'].ffill()
+        print(f"✓ Downloaded {len(sp500_data)} months of S&P 500 data")
+        print(f"  Date range: {sp500_data['Date'].min()} to {sp500_data['Date'].max()}")
 
-    # Filter to date range
-    treasury_10y_monthly = treasury_10y_monthly[
-        (treasury_10y_monthly.index >= START_DATE) &
-        (treasury_10y_monthly.index <= END_DATE)
-    ]
+    except Exception as e:
+        print(f"✗ Error downloading Shiller data: {e}")
+        print("  Please download manually from http://www.econ.yale.edu/~shiller/data.htm")
+        sp500_data = None
 
-    print(f"✓ Downloaded {len(treasury_10y_monthly)} months of 10-Year Treasury yield data")
-    print(f"  Date range: {treasury_10y_monthly.index.min()} to {treasury_10y_monthly.index.max()}")
+    return sp500_data
 
-except Exception as e:
-    print(f"✗ Error downloading 10-Year Treasury data: {e}")
-    treasury_10y_monthly = None
 
 # ============================================================================
-# 4. Download CPI Inflation from FRED
+# 2-4. Download Treasury Yields and CPI from FRED
 # ============================================================================
-print("\n[4/4] Downloading CPI inflation data from FRED...")
-
-fred_cpi_url = 'https://fred.stlouisfed.org/graph/fredgraph.csv?id=CPIAUCSL'
-
-try:
-    response = requests.get(fred_cpi_url, timeout=30)
-    response.raise_for_status()
-
-    cpi_df = pd.read_csv(io.StringIO(response.text))
-    cpi_df.columns = ['Date', 'CPI']
-    cpi_df['Date'] = pd.to_datetime(cpi_df['Date'])
-    cpi_df = cpi_df.set_index('Date')
+def process_fred(body, column, description, step):
+    """End-of-month values of a FRED series as a one-column table, or None if unavailable"""
+    print(f"\n[{step}/4] Processing {description} data from FRED...")
 
-    # Convert to numeric
-    cpi_df['CPI'] = pd.to_numeric(cpi_df['CPI'], errors='coerce')
+    try:
+        if isinstance(body, Exception):
+            raise body
 
-    # Calculate month-over-month inflation
-    cpi_df['CPI_Monthly_Inflation'] = cpi_df['CPI'].pct_change()
+        # Get end-of-month values, forward filling months without any (holidays/weekends)
+        monthly = fred_month_end(body).to_frame(column)
 
-    # Calculate 12-month (annual) inflation
-    cpi_df['CPI_Annual_Inflation'] = cpi_df['CPI'].pct_change(periods=12)
+        print(f"✓ Downloaded {len(monthly)} months of {description} data")
+        print(f"  Date range: {monthly.index.min()} to {monthly.index.max()}")
 
-    # Filter to date range
-    cpi_df = cpi_df[
-        (cpi_df.index >= START_DATE) &
-        (cpi_df.index <= END_DATE)
-    ]
+    except Exception as e:
+        print(f"✗ Error downloading {description} data: {e}")
+        monthly = None
 
-    print(f"✓ Downloaded {len(cpi_df)} months of CPI data")
-    print(f"  Date range: {cpi_df.index.min()} to {cpi_df.index.max()}")
+    return monthly
 
-except Exception as e:
-    print(f"✗ Error downloading CPI data: {e}")
-    cpi_df = None
 
 # ============================================================================
 # 5. Calculate Treasury Total Returns
 # ============================================================================
-print("\n" + "=" * 80)
-print("CALCULATING TREASURY TOTAL RETURNS USING DURATION APPROXIMATION")
-print("=" * 80)
+def calculate_treasury_returns(treasury_5y_monthly, treasury_10y_monthly):
+    """Add duration-approximated total return columns to the Treasury yield tables"""
+    print("\n" + "=" * 80)
+    print("CALCULATING TREASURY TOTAL RETURNS USING DURATION APPROXIMATION")
+    print("=" * 80)
 
-if treasury_5y_monthly is not None:
-    print("\n[5/6] Calculating 5-Year Treasury total returns...")
+    if treasury_5y_monthly is not None:
+        print("\n[5/6] Calculating 5-Year Treasury total returns...")
 
-    # Convert yields from percentage to decimal
-    treasury_5y_monthly['Yield_Decimal'] = treasury_5y_monthly['DGS5'] / 100
+        # Calculate total return using duration approximation
+        treasury_5y_monthly['Treasury_5Y_Return'] = yields_to_returns(treasury_5y_monthly['DGS5'].to_numpy(), DURATION_5Y)
 
-    # Calculate yield change
-    treasury_5y_monthly['Yield_Change'] = treasury_5y_monthly['Yield_Decimal'].diff()
+        print(f"✓ Calculated 5-Year Treasury total returns")
+        print(f"  Duration used: {DURATION_5Y} years")
+        print(f"  Average monthly return: {treasury_5y_monthly['Treasury_5Y_Return'].mean():.4%}")
+        print(f"  Annualized return: {(1 + treasury_5y_monthly['Treasury_5Y_Return'].mean())**12 - 1:.2%}")
 
-    # Calculate total return using duration approximation
-    # Total Return = (Yield / 12) - (Duration × Yield_Change)
-    treasury_5y_monthly['Treasury_5Y_Return'] = (
-        (treasury_5y_monthly['Yield_Decimal'] / 12) -
-        (DURATION_5Y * treasury_5y_monthly['Yield_Change'])
-    )
+    if treasury_10y_monthly is not None:
+        print("\n[6/6] Calculating 10-Year Treasury total returns...")
 
-    print(f"✓ Calculated 5-Year Treasury total returns")
-    print(f"  Duration used: {DURATION_5Y} years")
-    print(f"  Average monthly return: {treasury_5y_monthly['Treasury_5Y_Return'].mean():.4%}")
-    print(f"  Annualized return: {(1 + treasury_5y_monthly['Treasury_5Y_Return'].mean())**12 - 1:.2%}")
+        # Calculate total return using duration approximation
+        treasury_10y_monthly['Treasury_10Y_Return'] = yields_to_returns(treasury_10y_monthly['DGS10'].to_numpy(), DURATION_10Y)
 
-if treasury_10y_monthly is not None:
-    print("\n[6/6] Calculating 10-Year Treasury total returns...")
+        print(f"✓ Calculated 10-Year Treasury total returns")
+        print(f"  Duration used: {DURATION_10Y} years")
+        print(f"  Average monthly return: {treasury_10y_monthly['Treasury_10Y_Return'].mean():.4%}")
+        print(f"  Annualized return: {(1 + treasury_10y_monthly['Treasury_10Y_Return'].mean())**12 - 1:.2%}")
 
-    # Convert yields from percentage to decimal
-    treasury_10y_monthly['Yield_Decimal'] = treasury_10y_monthly['DGS10'] / 100
 
-    # Calculate yield change
-    treasury_10y_monthly['Yield_Change'] = treasury_10y_monthly['Yield_Decimal'].diff()
+def calculate_inflation(cpi_df):
+    """Add month-over-month and 12-month inflation columns to the CPI table"""
+    if cpi_df is None:
+        return
 
-    # Calculate total return using duration approximation
-    treasury_10y_monthly['Treasury_10Y_Return'] = (
-        (treasury_10y_monthly['Yield_Decimal'] / 12) -
-        (DURATION_10Y * treasury_10y_monthly['Yield_Change'])
-    )
+    # Calculate month-over-month inflation
+    cpi_df['CPI_Monthly_Inflation'] = pct_change(cpi_df['CPI'].to_numpy())
+
+    # Calculate 12-month (annual) inflation
+    cpi_df['CPI_Annual_Inflation'] = pct_change(cpi_df['CPI'].to_numpy(), periods=12)
 
-    print(f"✓ Calculated 10-Year Treasury total returns")
-    print(f"  Duration used: {DURATION_10Y} years")
-    print(f"  Average monthly return: {treasury_10y_monthly['Treasury_10Y_Return'].mean():.4%}")
-    print(f"  Annualized return: {(1 + treasury_10y_monthly['Treasury_10Y_Return'].mean())**12 - 1:.2%}")
 
 # ============================================================================
 # 6. Merge All Data and Create CSV
 # ============================================================================
-print("\n" + "=" * 80)
-print("MERGING DATA AND CREATING CSV FILE")
-print("=" * 80)
+def build_combined(sp500_data, treasury_5y_monthly, treasury_10y_monthly, cpi_df):
+    """Align every available series onto the month-end dates of the study period"""
+    print("\n" + "=" * 80)
+    print("MERGING DATA AND CREATING CSV FILE")
+    print("=" * 80)
 
-# Merge all dataframes
-if sp500_data is not None:
-    sp500_data = sp500_data.set_index('Date')
+    # Merge all dataframes
+    if sp500_data is not None:
+        sp500_data = sp500_data.set_index('Date')
 
-# Combine all data
-combined_df = pd.DataFrame(index=pd.date_range(start=START_DATE, end=END_DATE, freq='ME'))
+    # Collect each available output column, already named as in the CSV
+    columns = []
 
-if sp500_data is not None:
-    combined_df = combined_df.join(sp500_data[['SP500_Monthly_Return']], how='left')
+    if sp500_data is not None:
+        columns.append(sp500_data['SP500_Monthly_Return'].rename('SP500_Return'))
 
-if treasury_5y_monthly is not None:
-    combined_df = combined_df.join(treasury_5y_monthly[['Treasury_5Y_Return']], how='left')
+    if treasury_5y_monthly is not None:
+        columns.append(treasury_5y_monthly['Treasury_5Y_Return'])
 
-if treasury_10y_monthly is not None:
-    combined_df = combined_df.join(treasury_10y_monthly[['Treasury_10Y_Return']], how='left')
+    if treasury_10y_monthly is not None:
+        columns.append(treasury_10y_monthly['Treasury_10Y_Return'])
 
-if cpi_df is not None:
-    combined_df = combined_df.join(cpi_df[['CPI_Monthly_Inflation', 'CPI_Annual_Inflation']], how='left')
+    if cpi_df is not None:
+        columns.append(cpi_df['CPI_Monthly_Inflation'].rename('CPI_Monthly'))
+        columns.append(cpi_df['CPI_Annual_Inflation'].rename('CPI_Annual'))
 
-# Reset index to make Date a column
-combined_df = combined_df.reset_index()
+    # Each source has one row per month; a repeated date means its parsing went wrong
+    for col in columns:
+        if not col.index.is_unique:
+            repeated = col.index[col.index.duplicated()].unique()
+            raise ValueError(f"{col.name} has repeated dates, e.g. {', '.join(str(d.date()) for d in repeated[:3])}")
 
-# Rename columns properly
-rename_dict = {
-    'index': 'Date',
-    'SP500_Monthly_Return': 'SP500_Return',
-    'CPI_Monthly_Inflation': 'CPI_Monthly',
-    'CPI_Annual_Inflation': 'CPI_Annual'
-}
-combined_df = combined_df.rename(columns=rename_dict)
+    # Combine all data in one alignment onto the month-end dates, with Date as a column.
+    # This also trims every series to START_DATE..END_DATE
+    month_end_index = pd.date_range(start=START_DATE, end=END_DATE, freq='ME', name='Date')
+    combined_df = pd.concat(columns, axis=1) if columns else pd.DataFrame()
+    combined_df = combined_df.reindex(month_end_index).reset_index()
 
-# Remove any rows with all NaN values
-subset_cols = [col for col in ['SP500_Return', 'Treasury_5Y_Return', 'Treasury_10Y_Return', 'CPI_Monthly']
-               if col in combined_df.columns]
-if subset_cols:
-    combined_df = combined_df.dropna(how='all', subset=subset_cols)
+    # Remove any rows with all NaN values
+    subset_cols = [col for col in ['SP500_Return', 'Treasury_5Y_Return', 'Treasury_10Y_Return', 'CPI_Monthly']
+                   if col in combined_df.columns]
+    if subset_cols:
+        combined_df = combined_df.dropna(how='all', subset=subset_cols)
 
-# Save to CSV
-import os
-os.makedirs('data', exist_ok=True)
+    return combined_df
 
-combined_df.to_csv(OUTPUT_CSV, index=False, float_format='%.6f')
-
-print(f"\n✓ Created CSV file: {OUTPUT_CSV}")
-print(f"  Total months: {len(combined_df)}")
-print(f"  Date range: {combined_df['Date'].min()} to {combined_df['Date'].max()}")
-print(f"  Columns: {', '.join(combined_df.columns)}")
 
 # ============================================================================
 # 7. Create Metadata File
 # ============================================================================
-print(f"\n✓ Creating metadata file: {METADATA_FILE}")
-
-metadata = f"""Historical Market Data - Metadata
+def write_metadata(combined_df):
+    """Describe the sources, methodology and output format next to the CSV"""
+    print(f"\n✓ Creating metadata file: {METADATA_FILE}")
+
+    # Coverage within the output file (the downloads themselves can span more years),
+    # read off each column's first and last valid row rather than scanning for min/max
+    output = combined_df.set_index('Date')
+    sp500_start, sp500_end = coverage(output.get('SP500_Return'))
+    treasury_5y_start, treasury_5y_end = coverage(output.get('Treasury_5Y_Return'))
+    treasury_10y_start, treasury_10y_end = coverage(output.get('Treasury_10Y_Return'))
+    cpi_start, cpi_end = coverage(output.get('CPI_Monthly'))
+    generated = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+
+    metadata = f"""Historical Market Data - Metadata
 {'=' * 80}
 
 Data Sources:
@@ -322,7 +356,7 @@ Data Sources:
    - Source: Robert Shiller, Yale University
    - URL: http://www.econ.yale.edu/~shiller/data.htm
    - Calculation: (Price[t] + Dividend[t]) / Price[t-1] - 1
-   - Coverage: {sp500_data.index.min() if sp500_data is not None else 'N/A'} to {sp500_data.index.max() if sp500_data is not None else 'N/A'}
+   - Coverage: {sp500_start} to {sp500_end}
 
 2. 5-Year Treasury Total Returns
    - Source: FRED (Federal Reserve Economic Data)
@@ -331,7 +365,7 @@ Data Sources:
    - Calculation Method: Modified Duration Approximation
    - Modified Duration: {DURATION_5Y} years
    - Formula: Total Return = (Yield/12) - (Duration × ΔYield)
-   - Coverage: {treasury_5y_monthly.index.min() if treasury_5y_monthly is not None else 'N/A'} to {treasury_5y_monthly.index.max() if treasury_5y_monthly is not None else 'N/A'}
+   - Coverage: {treasury_5y_start} to {treasury_5y_end}
 
 3. 10-Year Treasury Total Returns
    - Source: FRED (Federal Reserve Economic Data)
@@ -340,7 +374,7 @@ Data Sources:
    - Calculation Method: Modified Duration Approximation
    - Modified Duration: {DURATION_10Y} years
    - Formula: Total Return = (Yield/12) - (Duration × ΔYield)
-   - Coverage: {treasury_10y_monthly.index.min() if treasury_10y_monthly is not None else 'N/A'} to {treasury_10y_monthly.index.max() if treasury_10y_monthly is not None else 'N/A'}
+   - Coverage: {treasury_10y_start} to {treasury_10y_end}
 
 4. CPI Inflation
    - Source: FRED (Federal Reserve Economic Data)
@@ -348,7 +382,7 @@ Data Sources:
    - Series: CPIAUCSL (Consumer Price Index for All Urban Consumers)
    - CPI_Monthly: Month-over-month inflation rate
    - CPI_Annual: 12-month (year-over-year) inflation rate
-   - Coverage: {cpi_df.index.min() if cpi_df is not None else 'N/A'} to {cpi_df.index.max() if cpi_df is not None else 'N/A'}
+   - Coverage: {cpi_start} to {cpi_end}
 
 Bond Math Methodology:
 ----------------------
@@ -389,21 +423,74 @@ Columns:
 Date Range: {START_DATE} to {END_DATE}
 Total Months: {len(combined_df)}
 
-Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
+Generated: {generated}
 Script: download_historical_data.py
 """
 
-with open(METADATA_FILE, 'w') as f:
-    f.write(metadata)
-
-print("\n" + "=" * 80)
-print("DOWNLOAD COMPLETE!")
-print("=" * 80)
-print(f"\nFiles created:")
-print(f"  1. {OUTPUT_CSV}")
-print(f"  2. {METADATA_FILE}")
-print(f"\nNext steps:")
-print(f"  1. Review the CSV file for data quality")
-print(f"  2. Run validation checks against Damodaran data")
-print(f"  3. Perform sanity checks on historical events")
-print("=" * 80)
+    with open(METADATA_FILE, 'w') as f:
+        f.write(metadata)
+
+
+def main():
+    """Download every source and write the combined CSV and its metadata"""
+    parser = argparse.ArgumentParser(description='Download historical market data for the Monte Carlo simulations')
+    parser.add_argument('--no-cache', action='store_true', help='re-download every source instead of reusing data/.cache')
+    args = parser.parse_args()
+
+    print("=" * 80)
+    print("DOWNLOADING HISTORICAL MARKET DATA (1965-2024)")
+    print("=" * 80)
+
+    # The four sources are independent, so wait on them together rather than back to back
+    print("\nFetching Shiller and FRED data in parallel...")
+    sources = [(SHILLER_URL, SHILLER_CACHE_TTL)]
+    sources += [(FRED_URL.format(series_id=series_id), FRED_CACHE_TTL) for series_id, _, _ in FRED_SERIES]
+    shiller_body, *fred_bodies = asyncio.run(fetch_all(sources, use_cache=not args.no_cache))
+
+    sp500_data = process_shiller(shiller_body)
+    treasury_5y_monthly, treasury_10y_monthly, cpi_df = [
+        process_fred(body, column, description, step)
+        for step, (body, (_, column, description)) in enumerate(zip(fred_bodies, FRED_SERIES), start=2)
+    ]
+
+    calculate_treasury_returns(treasury_5y_monthly, treasury_10y_monthly)
+    calculate_inflation(cpi_df)
+    combined_df = build_combined(sp500_data, treasury_5y_monthly, treasury_10y_monthly, cpi_df)
+
+    # Save to CSV
+    os.makedirs('data', exist_ok=True)
+
+    write_csv(combined_df, OUTPUT_CSV)
+
+    print(f"\n✓ Created CSV file: {OUTPUT_CSV}")
+    print(f"  Total months: {len(combined_df)}")
+    print(f"  Date range: {combined_df['Date'].min()} to {combined_df['Date'].max()}")
+    print(f"  Columns: {', '.join(combined_df.columns)}")
+
+    # Binary copy for downstream scripts, which can load it without re-parsing the CSV. It is
+    # stored as float32, which halves it and has no decimal formatting for the downcast to shift
+    if pa is not None:
+        value_columns = combined_df.columns.drop('Date')
+        combined_df.astype(dict.fromkeys(value_columns, np.float32)).to_parquet(
+            OUTPUT_PARQUET, engine='pyarrow', compression='zstd', index=False)
+        print(f"✓ Created Parquet file: {OUTPUT_PARQUET}")
+
+    write_metadata(combined_df)
+
+    print("\n" + "=" * 80)
+    print("DOWNLOAD COMPLETE!")
+    print("=" * 80)
+    print(f"\nFiles created:")
+    print(f"  1. {OUTPUT_CSV}")
+    print(f"  2. {METADATA_FILE}")
+    if pa is not None:
+        print(f"  3. {OUTPUT_PARQUET}")
+    print(f"\nNext steps:")
+    print(f"  1. Review the CSV file for data quality")
+    print(f"  2. Run validation checks against Damodaran data")
+    print(f"  3. Perform sanity checks on historical events")
+    print("=" * 80)
+
+
+if __name__ == '__main__':
+    main()
@@ -6,9 +6,29 @@ Fills in the gap for 1965-2024 monthly data
 
 import pandas as pd
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import argparse
+import io
 import time
 from datetime import datetime
 
+from _cache import cached_get
+
+# One pooled session so the ^GSPC fallback reuses the connection to Yahoo
+SESSION = requests.Session()
+SESSION.mount('https://', HTTPAdapter(pool_connections=1, pool_maxsize=2, max_retries=Retry(total=3, backoff_factor=0.3)))
+
+# Ask for compressed CSVs (requests decompresses them transparently) and identify the script
+SESSION.headers.update({'Accept-Encoding': 'gzip, deflate', 'User-Agent': 'retirement-planning-downloader/1.0'})
+
+# How long a cached download is reused
+YAHOO_CACHE_TTL = 24 * 60 * 60
+
+parser = argparse.ArgumentParser(description='Download S&P 500 monthly data from Yahoo Finance')
+parser.add_argument('--no-cache', action='store_true', help='re-download instead of reusing data/.cache')
+args = parser.parse_args()
+
 print("=" * 80)
 print("DOWNLOADING S&P 500 DATA FROM YAHOO FINANCE")
 print("=" * 80)
@@ -34,20 +54,18 @@ params = {
 }
 
 try:
-    response = requests.get(url, params=params, timeout=30)
-    response.raise_for_status()
+    body = cached_get(SESSION, url, YAHOO_CACHE_TTL, params=params, use_cache=not args.no_cache)
 
-    # Parse CSV
-    from io import StringIO
-    df = pd.read_csv(StringIO(response.text))
+    # Parse only the columns used below
+    df = pd.read_csv(io.BytesIO(body), usecols=['Date', 'Close'], dtype={'Close': 'float64'}, parse_dates=['Date'])
 
     print(f"✓ Downloaded {len(df)} months of data")
-    print(f"  Date range: {df['Date'].min()} to {df['Date'].max()}")
+    print(f"  Date range: {df['Date'].min():%Y-%m-%d} to {df['Date'].max():%Y-%m-%d}")
     print(f"  Columns: {list(df.columns)}")
 
-    # Convert to monthly returns
-    df['Date'] = pd.to_datetime(df['Date'])
-    df = df.sort_values('Date')
+    # Yahoo returns rows oldest first, so this only sorts if that ever changes
+    if not df['Date'].is_monotonic_increasing:
+        df = df.sort_values('Date')
 
     # Calculate monthly returns using adjusted close
     df['SP500_Return'] = df['Close'].pct_change()
@@ -73,17 +91,16 @@ except Exception as e:
     url = f"https://query1.finance.yahoo.com/v7/finance/download/{ticker}"
 
     try:
-        response = requests.get(url, params=params, timeout=30)
-        response.raise_for_status()
+        body = cached_get(SESSION, url, YAHOO_CACHE_TTL, params=params, use_cache=not args.no_cache)
 
-        df = pd.read_csv(StringIO(response.text))
+        df = pd.read_csv(io.BytesIO(body), usecols=['Date', 'Close'], dtype={'Close': 'float64'}, parse_dates=['Date'])
 
         print(f"✓ Downloaded {len(df)} months of S&P 500 price data")
-        print(f"  Date range: {df['Date'].min()} to {df['Date'].max()}")
+        print(f"  Date range: {df['Date'].min():%Y-%m-%d} to {df['Date'].max():%Y-%m-%d}")
         print(f"  ⚠️  Note: This is PRICE ONLY (no dividends)")
 
-        df['Date'] = pd.to_datetime(df['Date'])
-        df = df.sort_values('Date')
+        if not df['Date'].is_monotonic_increasing:
+            df = df.sort_values('Date')
         df['SP500_Price_Return'] = df['Close'].pct_change()
 
         sp500_data = df[['Date', 'SP500_Price_Return']].copy()
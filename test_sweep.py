@@ -8,11 +8,9 @@ from pathlib import Path
 # Change to frontend directory
 os.chdir('/workspaces/retirement-planning/frontend')
 
-# Load the module directly
-import importlib.util
-spec = importlib.util.spec_from_file_location("monte_carlo", "/workspaces/retirement-planning/frontend/api/monte-carlo.py")
-mc = importlib.util.module_from_spec(spec)
-spec.loader.exec_module(mc)
+# Import the API module as a package so its bytecode is cached in __pycache__
+sys.path.insert(0, '/workspaces/retirement-planning')
+from frontend.api import monte_carlo as mc
 
 import json
 